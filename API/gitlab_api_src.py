@@ -8,6 +8,7 @@ import random
 import json
 import logging
 from tqdm import tqdm
+from API.perf_src import perf_recorder
 from gitlab.exceptions import GitlabCreateError, GitlabGetError,GitlabListError, GitlabHttpError
 
 random.seed(42)
@@ -19,14 +20,15 @@ logging.basicConfig(level=logging.INFO,
                     filename='load_dataset_logfile.log',
                     filemode='w')
 class gitlab_flow():
-    def __init__(self, host, token, corpus_path='corpus.txt', max_attemps=5, db_waiting_time=0.25, disable_progress_bar=False):
+    def __init__(self, host, token, corpus_path='corpus.txt', max_attemps=5, db_waiting_time=0.25, disable_progress_bar=False, perf_output_path='load_dataset_perf.csv'):
 
         self.host = host
         self.token = token
         self.corpus = self.get_corpus(corpus_path)
         self.max_attemps = max_attemps
         self.db_waiting_time = db_waiting_time # db needs some time before creating a project or an invitation for a new user, or a branch for a new project.
-        self.gl = Gitlab(url = self.host, private_token = self.token)
+        self.perf = perf_recorder(perf_output_path) # time every event and api call during the replay, see flow().
+        self.gl = self.perf.wrap(Gitlab(url = self.host, private_token = self.token))
         self.progress_bar = disable_progress_bar
 
     def get_corpus(self, corpus_path):
@@ -305,41 +307,51 @@ class gitlab_flow():
 
     def flow(self, edge_list):
         logging.info(f'Workflow started')
-        for i in (pbar := tqdm(edge_list.index, disable=self.progress_bar)):
-            attempt = 0
-            while attempt < 5:
-                attempt += 1
-                try:
-                    if edge_list.loc[i, 'type'] == 'PullRequestEvent':
-                        self.create_pull_request(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
-                        pbar.set_description(f'{i} PullRequestEvent created')   
-                        logging.info(f'{i} PullRequestEvent created')
-                    if edge_list.loc[i, 'type'] == 'PushEvent':
-                        self.create_commit(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
-                        pbar.set_description(f'{i} PushEvent created')   
-                        logging.info(f'{i} PushEvent created')
-                    if edge_list.loc[i, 'type'] == 'ForkEvent':
-                        self.create_fork(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
-                        pbar.set_description(f'{i} ForkEvent created')   
-                        logging.info(f'{i} ForkEvent created')
-                    if edge_list.loc[i, 'type'] == 'WatchEvent':
-                        self.create_watch(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
-                        pbar.set_description(f'{i} WatchEvent created')   
-                        logging.info(f'{i} WatchEvent created')
-                    if edge_list.loc[i, 'type'] == 'FollowEvent':
-                        self.create_follow(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
-                        pbar.set_description(f'{i} FollowEvent created')   
-                        logging.info(f'{i} FollowEvent created')
-                    elif edge_list.loc[i, 'type'] not in ['PullRequestEvent', 'PushEvent', 'ForkEvent','WatchEvent', 'FollowEvent']:
-                        logging.critical(f"{i} {edge_list.loc[i, 'type']} Event not allowed")
-                        break
-                except Exception as e:
-                    error = str(e)
-                    tb = traceback.format_exc()
-                    pbar.set_description(f'Error on: {i} attempt: {attempt}')   
-                    logging.warning(f'{i} {edge_list.loc[i,:]} {error}')
-                    continue
-                break
-            else:
-                logging.critical(f'{i} {edge_list.loc[i, "type"]} {error} {tb}')
-        logging.info(f'Workflow endend')
+        self.perf.open()
+        try:
+            for i in (pbar := tqdm(edge_list.index, disable=self.progress_bar)):
+                attempt, event_start = 0, time.perf_counter()
+                while attempt < 5:
+                    attempt += 1
+                    self.perf.set_context(i, edge_list.loc[i, 'type'], edge_list.loc[i, 'target'], attempt)
+                    start = time.perf_counter()
+                    try:
+                        if edge_list.loc[i, 'type'] == 'PullRequestEvent':
+                            self.create_pull_request(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
+                            pbar.set_description(f'{i} PullRequestEvent created')   
+                            logging.info(f'{i} PullRequestEvent created')
+                        if edge_list.loc[i, 'type'] == 'PushEvent':
+                            self.create_commit(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
+                            pbar.set_description(f'{i} PushEvent created')   
+                            logging.info(f'{i} PushEvent created')
+                        if edge_list.loc[i, 'type'] == 'ForkEvent':
+                            self.create_fork(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
+                            pbar.set_description(f'{i} ForkEvent created')   
+                            logging.info(f'{i} ForkEvent created')
+                        if edge_list.loc[i, 'type'] == 'WatchEvent':
+                            self.create_watch(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
+                            pbar.set_description(f'{i} WatchEvent created')   
+                            logging.info(f'{i} WatchEvent created')
+                        if edge_list.loc[i, 'type'] == 'FollowEvent':
+                            self.create_follow(edge_list.loc[i, 'source'],edge_list.loc[i, 'target'])
+                            pbar.set_description(f'{i} FollowEvent created')   
+                            logging.info(f'{i} FollowEvent created')
+                        elif edge_list.loc[i, 'type'] not in ['PullRequestEvent', 'PushEvent', 'ForkEvent','WatchEvent', 'FollowEvent']:
+                            logging.critical(f"{i} {edge_list.loc[i, 'type']} Event not allowed")
+                            break
+                    except Exception as e:
+                        error, error_type, error_status = str(e), type(e).__name__, getattr(e, 'response_code', '') or ''
+                        tb = traceback.format_exc()
+                        pbar.set_description(f'Error on: {i} attempt: {attempt}')   
+                        logging.warning(f'{i} {edge_list.loc[i,:]} {error}')
+                        self.perf.record('attempt', time.perf_counter() - start, status=error_status, error=error_type)
+                        continue
+                    self.perf.record('attempt', time.perf_counter() - start)
+                    self.perf.record('event', time.perf_counter() - event_start)
+                    break
+                else:
+                    logging.critical(f'{i} {edge_list.loc[i, "type"]} {error} {tb}')
+                    self.perf.record('event', time.perf_counter() - event_start, status=error_status, error=error_type)
+        finally:
+            self.perf.close()
+        logging.info(f'Workflow endend')
\ No newline at end of file
@@ -0,0 +1,114 @@
+import os
+import csv
+import time
+import bisect
+import logging
+import numpy as np
+import pandas as pd
+
+class perf_recorder():
+    # Latency histogram bucket upper bounds, in milliseconds.
+    buckets = [10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf')]
+    columns = ['time', 'kind', 'index', 'event_type', 'project', 'attempt', 'method', 'endpoint', 'status', 'duration_ms', 'error']
+
+    def __init__(self, output_path='load_dataset_perf.csv', flush_every=1000):
+
+        self.output_path = output_path
+        self.flush_every = flush_every # rows buffered before writing to disk, keeps the overhead low during a run.
+        self.file = None # nothing is recorded until open() is called.
+
+    def open(self):
+        # Start a new recording, truncating any previous perf file.
+        self.file = open(self.output_path, 'w', newline='')
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(self.columns)
+        self.rows = []
+        self.stats = {} # (kind, event_type) -> streaming counters and histogram, durations themselves are only kept on disk.
+        self.context = {'index': None, 'event_type': '', 'project': None, 'attempt': None}
+
+    def set_context(self, index, event_type, project, attempt):
+        # Tag every following record with the event currently being replayed.
+        self.context = {'index': index, 'event_type': event_type, 'project': project, 'attempt': attempt}
+
+    def record(self, kind, duration, method='', endpoint='', status='', error=''):
+        # Store one timed API call ('request'), event attempt ('attempt') or event outcome ('event'), duration in seconds.
+        if self.file is None:
+            return
+        duration_ms = round(duration * 1000, 3) # rounded once, so the perf file and the summary agree.
+        ctx = self.context
+        self.rows.append([time.time(), kind, ctx['index'], ctx['event_type'], ctx['project'], ctx['attempt'], method, endpoint, status, duration_ms, error])
+        key = (kind, ctx['event_type'])
+        if key not in self.stats:
+            self.stats[key] = {'count': 0, 'client_errors': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'histogram': [0] * len(self.buckets)}
+        stats = self.stats[key]
+        stats['count'] += 1
+        stats['total_ms'] += duration_ms
+        stats['max_ms'] = max(stats['max_ms'], duration_ms)
+        stats['histogram'][bisect.bisect_left(self.buckets, duration_ms)] += 1
+        # 4xx answers are part of the replay's normal control flow (existence checks, duplicates),
+        # only 5xx answers and exceptions without a response count as errors.
+        if error and isinstance(status, int) and 400 <= status < 500:
+            stats['client_errors'] += 1
+        elif error:
+            stats['errors'] += 1
+        if len(self.rows) >= self.flush_every:
+            self.flush()
+
+    def wrap(self, gl):
+        # Time every HTTP request python-gitlab sends to the server.
+        http_request = gl.http_request
+        def timed_http_request(verb, path, *args, **kwargs):
+            start, status, error = time.perf_counter(), '', ''
+            try:
+                result = http_request(verb, path, *args, **kwargs)
+                status = result.status_code
+                return result
+            except Exception as e:
+                status = getattr(e, 'response_code', '') or ''
+                error = type(e).__name__
+                raise
+            finally:
+                self.record('request', time.perf_counter() - start, method=verb.upper(), endpoint=path, status=status, error=error)
+        gl.http_request = timed_http_request
+        return gl
+
+    def flush(self):
+        self.writer.writerows(self.rows)
+        self.file.flush()
+        self.rows = []
+
+    def summary(self):
+        # Per kind and event type: count, error rates, latency percentiles and cumulative histogram.
+        # Percentiles are computed from the perf file, so the durations never have to stay in memory.
+        labels = [f'le_{int(b)}ms' if np.isfinite(b) else 'le_inf' for b in self.buckets]
+        columns = ['kind', 'event_type', 'count', 'client_errors', 'client_error_rate', 'errors', 'error_rate', 'mean_ms', 'p50_ms', 'p90_ms', 'p95_ms', 'p99_ms', 'max_ms'] + labels
+        if not self.stats:
+            return pd.DataFrame([], columns=columns)
+        data = pd.read_csv(self.output_path, usecols=['kind', 'event_type', 'duration_ms'], dtype={'kind': str, 'event_type': str, 'duration_ms': float}, keep_default_na=False)
+        percentiles = data.groupby(['kind', 'event_type'])['duration_ms'].quantile([0.5, 0.9, 0.95, 0.99]).unstack()
+        summary = []
+        for (kind, event_type), stats in sorted(self.stats.items(), key=lambda x: (x[0][0], str(x[0][1]))):
+            p50, p90, p95, p99 = percentiles.loc[(kind, str(event_type))]
+            row = {'kind': kind, 'event_type': event_type, 'count': stats['count'],
+                   'client_errors': stats['client_errors'], 'client_error_rate': stats['client_errors'] / stats['count'],
+                   'errors': stats['errors'], 'error_rate': stats['errors'] / stats['count'],
+                   'mean_ms': stats['total_ms'] / stats['count'], 'p50_ms': p50, 'p90_ms': p90, 'p95_ms': p95, 'p99_ms': p99, 'max_ms': stats['max_ms']}
+            row.update(dict(zip(labels, np.cumsum(stats['histogram']))))
+            summary.append(row)
+        return pd.DataFrame(summary, columns=columns)
+
+    def close(self):
+        # Write remaining rows and the run summary next to the raw data.
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+        summary = self.summary()
+        summary_path = os.path.splitext(self.output_path)[0] + '_summary.csv'
+        summary.to_csv(summary_path, index=False)
+        if summary.empty:
+            logging.info(f'No performance data recorded')
+        for row in summary.itertuples():
+            logging.info(f'{row.kind} {row.event_type} count: {row.count} error_rate: {row.error_rate:.3f} client_error_rate: {row.client_error_rate:.3f} p50: {row.p50_ms:.1f}ms p95: {row.p95_ms:.1f}ms p99: {row.p99_ms:.1f}ms')
+        return summary
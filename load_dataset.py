@@ -9,11 +9,12 @@ def main():
     parser.add_argument('--input_file_path', type=str)
     parser.add_argument('--token', type=str)
     parser.add_argument('--host', type=str, default='http://localhost')
+    parser.add_argument('--perf_output_path', type=str, default='load_dataset_perf.csv')
 
     args = parser.parse_args()
 
     # Instanciate our library wrapper class
-    gf = gitlab_flow(host=args.host, token=args.token)
+    gf = gitlab_flow(host=args.host, token=args.token, perf_output_path=args.perf_output_path)
 
     # Read the whole dataset and filter relevant columns
     ds = pd.read_csv(args.input_file_path)